@@ -1,151 +1,310 @@
+from calendar import isleap
 from collections import UserDict
-from datetime import datetime, timedelta
-from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Protocol
+import gzip
+import os
 import pickle
+import re
+import sys
 
-class DataRepository(ABC):
-    @abstractmethod
-    def save_data(self, data, filename):
-        pass
-    
-    @abstractmethod
-    def load_data(self, filename):
-        pass
+PHONE_PATTERN = re.compile(r"\A\d{10}\Z")
+BIRTHDAY_PATTERN = re.compile(r"\A(\d{1,2})\.(\d{1,2})\.(\d{4})\Z")
+
+class DataRepository(Protocol):
+    def save_data(self, data: "RecordManager", filename): ...
+
+    def load_data(self, filename) -> "RecordManager": ...
+
+class PlainDataUnpickler(pickle.Unpickler):
+    # saved data holds only builtin lists, tuples and strings - never load classes or functions
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Global '{module}.{name}' is forbidden")
+
+class LegacyObject:
+    # stands in for the classes of an old pickled AddressBook - only their attributes are kept
+    pass
+
+class LegacyDataUnpickler(pickle.Unpickler):
+    # older versions pickled the AddressBook object itself; read it once and convert to plain records
+    LEGACY_MODULES = frozenset(("__main__", "main"))
+    LEGACY_CLASSES = frozenset(("AddressBook", "Record", "Name", "Phone", "Birthday"))
+
+    def find_class(self, module, name):
+        if module in self.LEGACY_MODULES and name in self.LEGACY_CLASSES:
+            return LegacyObject
+        if module == "datetime" and name == "datetime":
+            return datetime
+        raise pickle.UnpicklingError(f"Global '{module}.{name}' is forbidden")
+
+    def load_payload(self):
+        book = self.load()
+        try:
+            return [
+                (
+                    record.name.value,
+                    [p.value for p in record.phones],
+                    record.birthday.value.date().isoformat() if record.birthday else None,
+                )
+                for record in book.data.values()
+            ]
+        except AttributeError:
+            raise pickle.UnpicklingError("Unknown address book format")
+
+class AddressBookDataRepository:
+    GZIP_MAGIC = b"\x1f\x8b"
+    BUFFER_SIZE = 1 << 20
 
-class AddressBookDataRepository(DataRepository):
     def save_data(self, data, filename="addressbook.pkl"):
-        with open(filename, "wb") as f:
-            pickle.dump(data, f)
+        payload = [
+            (
+                record.name.value,
+                list(record.phones),
+                record.birthday.value.isoformat() if record.birthday else None,
+            )
+            for record in data.data.values()
+        ]
+        # write next to the target and swap it in, so a crash mid-write never corrupts the book
+        tmp_filename = filename + ".tmp"
+        try:
+            with open(tmp_filename, "wb", buffering=self.BUFFER_SIZE) as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL, fix_imports=False)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
+            raise
+        data.mark_saved()
 
     def load_data(self, filename="addressbook.pkl"):
+        migrated = False
         try:
-            with open(filename, "rb") as f:
-                return pickle.load(f)
+            with open(filename, "rb", buffering=self.BUFFER_SIZE) as raw:
+                if raw.read(2) == self.GZIP_MAGIC:
+                    raw.seek(0)
+                    with gzip.GzipFile(fileobj=raw, mode="rb") as f:
+                        payload = PlainDataUnpickler(f, fix_imports=False).load()
+                else:
+                    # uncompressed file written by an older version
+                    raw.seek(0)
+                    payload = LegacyDataUnpickler(raw, fix_imports=False).load_payload()
+                    migrated = True
         except FileNotFoundError:
-            return AddressBook() 
+            return AddressBook()
+
+        book = AddressBook()
+        for name, phones, birthday in payload:
+            record = Record(name)
+            record.phones = dict.fromkeys(phones)
+            if birthday:
+                record.birthday = Birthday._unchecked(date.fromisoformat(birthday))
+            book.add_record(record)
+        # a migrated book stays dirty, so it is rewritten in the current format on the next save
+        if not migrated:
+            book.mark_saved()
+        return book
 
 
 class CheckPhoneNumber(Exception):
     pass
 
-class Field(ABC):
+class Field:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
     
     def __str__(self):
         return str(self.value)
 
+    @classmethod
+    def _unchecked(cls, value):
+        # for already validated values, e.g. loaded from our own file
+        field = cls.__new__(cls)
+        Field.__init__(field, value)
+        return field
+
 class Name(Field):
-    pass
+    __slots__ = ()
+
+    def __init__(self, value):
+        # names are the AddressBook keys - interned strings make dict lookups hit on identity
+        super().__init__(sys.intern(value))
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        if not value.isdigit():
-           raise CheckPhoneNumber(f'Phone {value} is not digit') 
-        elif len(value) != 10:
+        if not PHONE_PATTERN.match(value):
+            if not value.isdigit():
+                raise CheckPhoneNumber(f'Phone {value} is not digit')
             raise CheckPhoneNumber(f'Phone {value} > 10 digits')
         super().__init__(value)
 
 
 class Birthday(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         try:
-            super().__init__(datetime.strptime(value, "%d.%m.%Y"))
+            # precompiled pattern + date() is much cheaper than strptime
+            match = BIRTHDAY_PATTERN.match(value)
+            if not match:
+                raise ValueError
+            day, month, year = match.groups()
+            super().__init__(date(int(year), int(month), int(day)))
         except ValueError:
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
-class RecordBase(ABC):
-    @abstractmethod
-    def __str__(self):
-        pass
+class RecordBase(Protocol):
+    def __str__(self): ...
 
-    @abstractmethod
-    def add_phone(self, phone):
-        pass
+    def add_phone(self, phone): ...
 
-    @abstractmethod
-    def remove_phone(self, phone):
-        pass
+    def remove_phone(self, phone): ...
 
-    @abstractmethod
-    def remove_all_phones(self):
-        pass
+    def remove_all_phones(self): ...
 
-    @abstractmethod
-    def edit_phone(self, old_phone, new_phone):
-        pass
+    def edit_phone(self, old_phone, new_phone): ...
 
-    @abstractmethod
-    def find_phone(self, phone):
-        pass
+    def find_phone(self, phone): ...
+
+    def add_birthday(self, birthday_date): ...
 
-    @abstractmethod
-    def add_birthday(self, birthday_date):
-        pass
 
+class Record:
+    __slots__ = ('name', 'phones', 'birthday', '_book', '_str_cache')
 
-class Record(RecordBase):
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
+        self.phones = {}  # ordered set of validated numbers (values unused)
         self.birthday = None
+        self._book = None  # set by AddressBook.add_record
+        self._str_cache = None  # reset by every mutator via _changed()
     
     def __str__(self):
-        return f"Contact name: {self.name.value}, phones: {'; '.join(p.value for p in self.phones)}, birthday: {self.birthday.value.strftime('%d.%m.%Y') if self.birthday else 'N/A'}"
+        if self._str_cache is None:
+            self._str_cache = "Contact name: %s, phones: %s, birthday: %s" % (
+                self.name.value,
+                "; ".join(self.phones),
+                self.birthday.value.strftime('%d.%m.%Y') if self.birthday else 'N/A',
+            )
+        return self._str_cache
     
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        Phone(phone)  # validate only
+        self.phones[phone] = None
+        self._changed()
     
     def remove_phone(self, phone):
-        self.phones = [p for p in self.phones if p.value != phone]
+        self.phones.pop(phone, None)
+        self._changed()
     
     def remove_all_phones(self):
-        self.phones = []
+        self.phones.clear()
+        self._changed()
 
     def edit_phone(self, old_phone, new_phone):
         try:
-            new_phone_obj = Phone(new_phone)  
+            Phone(new_phone)
         except CheckPhoneNumber as e:
             return str(e)
         
-        for phone in self.phones:
-            if phone.value == old_phone:
-                phone.value = new_phone_obj.value
+        if old_phone in self.phones:
+            # rebuild so the edited number keeps its position
+            self.phones = {new_phone if p == old_phone else p: None for p in self.phones}
+            self._changed()
 
     def find_phone(self, phone):
-        try:
-            found_phone = next(item for item in self.phones if item.value == phone)
-            return found_phone
-        except StopIteration:
-            return None
+        if phone in self.phones:
+            return Phone._unchecked(phone)
+        return None
         
     def add_birthday(self, birthday_date):
+        old_birthday = self.birthday
         self.birthday = Birthday(birthday_date)
+        self._changed()
+        if self._book is not None:
+            self._book._reindex_birthday(self, old_birthday)
 
-class RecordManager(ABC):
-    @abstractmethod
-    def add_record(self, record):
-        pass
+    def _changed(self):
+        self._str_cache = None
+        if self._book is not None:
+            self._book._dirty = True
 
-    @abstractmethod
-    def find(self, name):
-        pass
-    
-    @abstractmethod
-    def delete(self, name):
-        pass
+class RecordManager(Protocol):
+    def add_record(self, record: RecordBase): ...
 
+    def find(self, name) -> RecordBase | None: ...
+
+    def delete(self, name): ...
+
+    def find_birthdays(self, month, day): ...
+
+
+class AddressBook(UserDict):
+    def __init__(self, *args, **kwargs):
+        self._birthday_index = {}  # (month, day) -> [contact names]
+        self._dirty = False  # unsaved changes since load/save
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name, record):
+        old_record = self.data.get(name)
+        if old_record is not None:
+            old_record._book = None
+            self._unindex_birthday(name, old_record.birthday)
+        self.data[name] = record
+        record._book = self
+        if record.birthday:
+            self._index_birthday(name, record.birthday)
+        self._dirty = True
+
+    def __delitem__(self, name):
+        record = self.data.pop(name)
+        record._book = None
+        self._unindex_birthday(name, record.birthday)
+        self._dirty = True
+
+    @property
+    def dirty(self):
+        return self._dirty
+
+    def mark_saved(self):
+        self._dirty = False
 
-class AddressBook(UserDict, RecordManager):
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name):
         return self.data.get(name)
     
     def delete(self, name):
         if name in self.data:
-            del self.data[name]
+            del self[name]
+
+    def find_birthdays(self, month, day):
+        return self._birthday_index.get((month, day), ())
+
+    def _index_birthday(self, name, birthday):
+        key = (birthday.value.month, birthday.value.day)
+        self._birthday_index.setdefault(key, []).append(name)
+
+    def _unindex_birthday(self, name, birthday):
+        if birthday is None:
+            return
+        key = (birthday.value.month, birthday.value.day)
+        names = self._birthday_index.get(key)
+        if names and name in names:
+            names.remove(name)
+            if not names:
+                del self._birthday_index[key]
+
+    def _reindex_birthday(self, record, old_birthday):
+        name = record.name.value
+        self._unindex_birthday(name, old_birthday)
+        self._index_birthday(name, record.birthday)
 
 
 class BirthdayManager:
@@ -163,42 +322,37 @@ class BirthdayManager:
         return birthday
 
     @staticmethod
-    def get_upcoming_birthdays(address_book: RecordManager, days=7):
-        print(address_book)
+    def get_upcoming_birthdays(address_book: RecordManager, days=7, today=None):
         upcoming_birthdays = []
-        today = datetime.today()
-        for name, record in address_book.data.items():
-            if record.birthday:
-                birthday_this_year = record.birthday.value.replace(year=today.year)
-                if birthday_this_year < today:
-                    birthday_this_year = record.birthday.value.replace(year=today.year + 1)
-
-                if 0 <= (birthday_this_year - today).days <= days:
-                    birthday_this_year = BirthdayManager.adjust_for_weekend(birthday_this_year)
-                    upcoming_birthdays.append({"Contact": name, "upcoming birthday": birthday_this_year.strftime("%d.%m.%Y")})
+        today_ordinal = (today or date.today()).toordinal()
+        # window is today .. today + days inclusive; look up only those calendar days instead of scanning every contact
+        for ordinal in range(today_ordinal, today_ordinal + days + 1):
+            birthday_this_year = date.fromordinal(ordinal)
+            names = address_book.find_birthdays(birthday_this_year.month, birthday_this_year.day)
+            if (birthday_this_year.month, birthday_this_year.day) == (3, 1) and not isleap(birthday_this_year.year):
+                # 29 February birthdays are celebrated on 1 March in non-leap years
+                names = [*names, *address_book.find_birthdays(2, 29)]
+            if not names:
+                continue
+            congratulation_date = BirthdayManager.adjust_for_weekend(birthday_this_year).strftime("%d.%m.%Y")
+            for name in names:
+                upcoming_birthdays.append({"Contact": name, "upcoming birthday": congratulation_date})
         return upcoming_birthdays
   
-def input_error(func):
-    def inner(*args, **kwargs):
-        try:
-            return func(*args, **kwargs)
-        except ValueError:
-            return "Incorrect value."
-        except KeyError:
-            return "Enter the argument for the command"
-        except IndexError:
-            return "Enter the argument for the command"
-
-    return inner
+ARGUMENT_ERROR = "Enter the argument for the command"
 
+@lru_cache(maxsize=128)
 def parse_input(user_input):
-    cmd, *args = user_input.split()
-    cmd = cmd.strip().lower()
-    return cmd, *args
+    # split off the command on any whitespace; arguments are tokenized only if present
+    cmd, *rest = user_input.split(None, 1) or [""]
+    # args is a tuple: cached results are shared between calls and must stay immutable
+    args = tuple(rest[0].split()) if rest else ()
+    return cmd.lower(), args
     
-@input_error
 def add_contact(args, book: AddressBook):
-    name, phone, *_ = args
+    if len(args) < 2:
+        return ARGUMENT_ERROR
+    name, phone = args[0], args[1]
     record = book.find(name)
     message = "Contact updated."
     if record is None:
@@ -209,9 +363,10 @@ def add_contact(args, book: AddressBook):
         record.add_phone(phone)
     return message
 
-@input_error
 def change_contact(args, book: AddressBook):
-    name, phone, *_ = args
+    if len(args) < 2:
+        return ARGUMENT_ERROR
+    name, phone = args[0], args[1]
     record = book.find(name)
     message = "Contact changed."
     if record is None:
@@ -221,18 +376,20 @@ def change_contact(args, book: AddressBook):
         record.add_phone(phone)
     return message
 
-@input_error
 def get_phone(args, book: AddressBook):
-    name, *_ = args
+    if not args:
+        return ARGUMENT_ERROR
+    name = args[0]
     record = book.find(name)
     if record is None:
         return f"Contact not found!"
     else:
         return f"{record}"
     
-@input_error
 def add_birthday(args, book: AddressBook):
-    name, birthday_date, *_ = args
+    if len(args) < 2:
+        return ARGUMENT_ERROR
+    name, birthday_date = args[0], args[1]
     record = book.find(name)
     message = "Contact birthday updated."
     if record is None:
@@ -240,12 +397,16 @@ def add_birthday(args, book: AddressBook):
         book.add_record(record)
         message = "Contact added. Birthday updated."
     if birthday_date:
-        record.add_birthday(birthday_date)
+        try:
+            record.add_birthday(birthday_date)
+        except ValueError:
+            return "Incorrect value."
     return message
 
-@input_error
 def show_birthday(args, book: AddressBook):
-    name, *_ = args
+    if not args:
+        return ARGUMENT_ERROR
+    name = args[0]
     record = book.find(name)
     if record is None:
         return f"Contact not found!"
@@ -259,46 +420,46 @@ def show_birthday(args, book: AddressBook):
 def birthdays(book: AddressBook):
     return BirthdayManager.get_upcoming_birthdays(book)
 
+def show_all(args, book: AddressBook):
+    if book.data:
+        # one write for the whole book instead of a print per record
+        sys.stdout.write("\n".join(map(str, book.data.values())))
+        sys.stdout.write("\n")
+
+
+EXIT_COMMANDS = frozenset(("close", "exit"))
+
+COMMANDS = {
+    "hello": lambda args, book: print("How can I help you?"),
+    "add": lambda args, book: print(add_contact(args, book)),
+    "change": lambda args, book: print(change_contact(args, book)),
+    "phone": lambda args, book: print(get_phone(args, book)),
+    "all": show_all,
+    "add-birthday": lambda args, book: print(add_birthday(args, book)),
+    "show-birthday": lambda args, book: print(show_birthday(args, book)),
+    "birthdays": lambda args, book: print(birthdays(book)),
+}
+
 def main():
-    address_book_repository = AddressBookDataRepository()
+    address_book_repository: DataRepository = AddressBookDataRepository()
     book = address_book_repository.load_data()
 
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
         
-        command, *args = parse_input(user_input)
+        command, args = parse_input(user_input)
+
+        handler = COMMANDS.get(command)
+        if handler is not None:
+            handler(args, book)
 
-        if command in ["close", "exit"]:
-            address_book_repository.save_data(book)
+        elif command in EXIT_COMMANDS:
+            if book.dirty:
+                address_book_repository.save_data(book)
             print("Good bye!")
             break
 
-        elif command == "hello":
-            print("How can I help you?")
-
-        elif command == "add":
-            print(add_contact(args, book))
-
-        elif command == "change":
-            print(change_contact(args, book))
-
-        elif command == "phone":
-            print(get_phone(args, book))
-
-        elif command == "all":
-            for name, record in book.data.items():
-                print(record)
-
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-
-        elif command == "birthdays":
-            print(birthdays(book))
-
         else:
             print("Invalid command.")
 
@@ -0,0 +1,63 @@
+from datetime import date
+
+from main import AddressBook, BirthdayManager, Record
+
+
+def make_book(**birthdays):
+    book = AddressBook()
+    for name, birthday in birthdays.items():
+        record = Record(name)
+        record.add_birthday(birthday)
+        book.add_record(record)
+    return book
+
+
+def test_leap_day_birthday_in_non_leap_year():
+    book = make_book(Roman="29.02.2000")
+
+    upcoming = BirthdayManager.get_upcoming_birthdays(book, today=date(2027, 2, 25))
+
+    # 01.03.2027 is a Monday
+    assert upcoming == [{"Contact": "Roman", "upcoming birthday": "01.03.2027"}]
+
+
+def test_leap_day_birthday_in_leap_year():
+    book = make_book(Roman="29.02.2000")
+
+    upcoming = BirthdayManager.get_upcoming_birthdays(book, today=date(2028, 2, 25))
+
+    # 29.02.2028 is a Tuesday
+    assert upcoming == [{"Contact": "Roman", "upcoming birthday": "29.02.2028"}]
+
+
+def test_window_includes_today_and_ends_after_days():
+    # 15.10.2026 is a Thursday
+    book = make_book(Today="15.10.1990", Last="22.10.1990", TooLate="23.10.1990")
+
+    upcoming = BirthdayManager.get_upcoming_birthdays(book, today=date(2026, 10, 15))
+
+    assert upcoming == [
+        {"Contact": "Today", "upcoming birthday": "15.10.2026"},
+        {"Contact": "Last", "upcoming birthday": "22.10.2026"},
+    ]
+
+
+def test_index_follows_replace_delete_and_birthday_change():
+    book = make_book(A="16.10.1990", B="17.10.1990")
+    old_a = book.find("A")
+
+    book.add_record(Record("A"))
+    old_a.add_birthday("18.10.2000")
+    del book["B"]
+    book.find("A").add_birthday("19.10.1990")
+    book.find("A").add_birthday("20.10.1990")
+
+    assert old_a._book is None
+    assert book.find_birthdays(10, 16) == ()
+    assert book.find_birthdays(10, 17) == ()
+    assert book.find_birthdays(10, 18) == ()
+    assert book.find_birthdays(10, 19) == ()
+    assert book.find_birthdays(10, 20) == ["A"]
+    upcoming = BirthdayManager.get_upcoming_birthdays(book, today=date(2026, 10, 15))
+    # 20.10.2026 is a Tuesday
+    assert upcoming == [{"Contact": "A", "upcoming birthday": "20.10.2026"}]
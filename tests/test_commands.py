@@ -0,0 +1,11 @@
+from main import parse_input
+
+
+def test_parse_input_splits_on_any_whitespace():
+    assert parse_input("add\tJohn 1234567890") == ("add", ("John", "1234567890"))
+    assert parse_input("  ADD   John\t1234567890 \n") == ("add", ("John", "1234567890"))
+
+
+def test_parse_input_without_arguments():
+    assert parse_input("all") == ("all", ())
+    assert parse_input("   ") == ("", ())
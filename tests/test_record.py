@@ -0,0 +1,71 @@
+import pytest
+
+from main import AddressBook, Record, birthdays, get_phone, show_all, show_birthday
+
+
+def test_edit_phone_keeps_position():
+    record = Record("Roman")
+    record.add_phone("1111111111")
+    record.add_phone("2222222222")
+
+    record.edit_phone("1111111111", "3333333333")
+
+    assert list(record.phones) == ["3333333333", "2222222222"]
+    assert str(record) == "Contact name: Roman, phones: 3333333333; 2222222222, birthday: N/A"
+
+
+def make_saved_book():
+    book = AddressBook()
+    record = Record("Roman")
+    record.add_phone("1111111111")
+    book.add_record(record)
+    book.mark_saved()
+    return book, record
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda record: record.add_phone("2222222222"),
+        lambda record: record.edit_phone("1111111111", "3333333333"),
+        lambda record: record.remove_all_phones(),
+        lambda record: record.add_birthday("16.10.1990"),
+    ],
+    ids=["add_phone", "edit_phone", "remove_all_phones", "add_birthday"],
+)
+def test_record_mutators_mark_book_dirty(mutate):
+    book, record = make_saved_book()
+
+    mutate(record)
+
+    assert book.dirty
+
+
+def test_read_only_session_leaves_book_clean(capsys):
+    book, record = make_saved_book()
+
+    get_phone(("Roman",), book)
+    show_birthday(("Roman",), book)
+    show_all((), book)
+    birthdays(book)
+    book.find("Roman").find_phone("1111111111")
+
+    assert not book.dirty
+
+
+def test_mutators_reset_cached_string():
+    record = Record("Roman")
+    assert str(record) == "Contact name: Roman, phones: , birthday: N/A"
+
+    record.add_phone("1111111111")
+    assert str(record) == "Contact name: Roman, phones: 1111111111, birthday: N/A"
+
+    record.add_phone("2222222222")
+    record.remove_phone("1111111111")
+    assert str(record) == "Contact name: Roman, phones: 2222222222, birthday: N/A"
+
+    record.remove_all_phones()
+    assert str(record) == "Contact name: Roman, phones: , birthday: N/A"
+
+    record.add_birthday("16.10.1990")
+    assert str(record) == "Contact name: Roman, phones: , birthday: 16.10.1990"
@@ -0,0 +1,95 @@
+import pickle
+from datetime import date
+
+import pytest
+
+from main import AddressBook, AddressBookDataRepository, Record
+
+# AddressBook pickled by the original version of main.py (run as __main__):
+# Roman - 1234567890, 0987654321, born 29.02.2000; Ann - no phones, no birthday
+LEGACY_ADDRESSBOOK = (
+    b"\x80\x04\x95'\x01\x00\x00\x00\x00\x00\x00\x8c\x08__main__\x94\x8c\x0bAddressBook\x94\x93\x94)\x81\x94}\x94\x8c\x04dat"
+    b'a\x94}\x94(\x8c\x05Roman\x94h\x00\x8c\x06Record\x94\x93\x94)\x81\x94}\x94(\x8c\x04name\x94h\x00\x8c\x04Name\x94'
+    b'\x93\x94)\x81\x94}\x94\x8c\x05value\x94h\x07sb\x8c\x06phones\x94]\x94(h\x00\x8c\x05Phone\x94\x93\x94)\x81\x94}\x94'
+    b'h\x11\x8c\n1234567890\x94sbh\x15)\x81\x94}\x94h\x11\x8c\n0987654321\x94sbe\x8c\x08birt'
+    b'hday\x94h\x00\x8c\x08Birthday\x94\x93\x94)\x81\x94}\x94h\x11\x8c\x08datetime\x94\x8c\x08datetime'
+    b'\x94\x93\x94C\n\x07\xd0\x02\x1d\x00\x00\x00\x00\x00\x00\x94\x85\x94R\x94sbub\x8c\x03Ann\x94h\t)\x81\x94}\x94(h\x0ch\x0e)\x81\x94}\x94h'
+    b"\x11h'sbh\x12]\x94h\x1cNubusb."
+)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    filename = str(tmp_path / "addressbook.pkl")
+    repository = AddressBookDataRepository()
+    book = AddressBook()
+    record = Record("Roman")
+    record.add_phone("1234567890")
+    record.add_phone("0987654321")
+    record.add_birthday("29.02.2000")
+    book.add_record(record)
+    book.add_record(Record("Ann"))
+
+    repository.save_data(book, filename)
+    loaded = repository.load_data(filename)
+
+    assert [str(r) for r in loaded.data.values()] == [str(r) for r in book.data.values()]
+    assert loaded.find_birthdays(2, 29) == ["Roman"]
+    assert not loaded.dirty
+
+
+def test_load_legacy_pickled_address_book(tmp_path):
+    path = tmp_path / "addressbook.pkl"
+    path.write_bytes(LEGACY_ADDRESSBOOK)
+    repository = AddressBookDataRepository()
+
+    book = repository.load_data(str(path))
+
+    assert str(book.find("Roman")) == "Contact name: Roman, phones: 1234567890; 0987654321, birthday: 29.02.2000"
+    assert str(book.find("Ann")) == "Contact name: Ann, phones: , birthday: N/A"
+    # migrated books are written back in the current format
+    assert book.dirty
+    repository.save_data(book, str(path))
+    assert path.read_bytes()[:2] == AddressBookDataRepository.GZIP_MAGIC
+    assert str(repository.load_data(str(path)).find("Roman")) == str(book.find("Roman"))
+
+
+def test_load_rejects_unknown_globals(tmp_path):
+    path = tmp_path / "addressbook.pkl"
+    path.write_bytes(pickle.dumps(print))
+
+    with pytest.raises(pickle.UnpicklingError):
+        AddressBookDataRepository().load_data(str(path))
+
+
+def test_failed_save_keeps_old_file_and_removes_temp_file(tmp_path, monkeypatch):
+    path = tmp_path / "addressbook.pkl"
+    repository = AddressBookDataRepository()
+    book = AddressBook()
+    book.add_record(Record("Roman"))
+    repository.save_data(book, str(path))
+    saved = path.read_bytes()
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pickle, "dump", broken_dump)
+    with pytest.raises(OSError):
+        repository.save_data(book, str(path))
+
+    assert path.read_bytes() == saved
+    assert not (tmp_path / "addressbook.pkl.tmp").exists()
+
+
+def test_round_trip_keeps_birthday_before_year_1000(tmp_path):
+    filename = str(tmp_path / "addressbook.pkl")
+    repository = AddressBookDataRepository()
+    book = AddressBook()
+    record = Record("Roman")
+    record.add_birthday("01.01.0999")
+    book.add_record(record)
+
+    repository.save_data(book, filename)
+    loaded = repository.load_data(filename)
+
+    assert loaded.find("Roman").birthday.value == date(999, 1, 1)
+    assert loaded.find_birthdays(1, 1) == ["Roman"]